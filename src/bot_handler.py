@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
+from collections import OrderedDict
 from datetime import datetime
 from io import BytesIO
 from typing import Dict
@@ -21,10 +23,12 @@ from .config import Settings
 from .data_processor import DataProcessor
 from .excel_generator import ExcelGenerator
 from .file_manager import FileManager
-from .models import SessionData
+from .models import ParsedData, SessionData
 
 LOGGER = logging.getLogger(__name__)
 BATCH_KEY = "PENDING_DOCUMENTS_BATCH"
+PARSE_CACHE_SIZE = 64
+BATCH_DEBOUNCE_SECONDS = 2.0
 
 class BotHandler:
     def __init__(self, settings: Settings) -> None:
@@ -33,6 +37,8 @@ class BotHandler:
         self.data_processor = DataProcessor()
         self.excel_generator = ExcelGenerator()
         self.sessions: Dict[int, SessionData] = {}
+        # Re-submitted exports are recognised by content hash and not parsed again.
+        self._parse_cache: OrderedDict[bytes, ParsedData] = OrderedDict()
         self.application = (
             ApplicationBuilder()
             .token(settings.token)
@@ -54,8 +60,7 @@ class BotHandler:
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         if not update.effective_user or not update.message:
             return
-        if BATCH_KEY in context.chat_data:
-            del context.chat_data[BATCH_KEY]
+        self._drop_batch(context)
         session = self._get_session(update.effective_user.id)
         session.reset()
         await update.message.reply_text(
@@ -84,10 +89,10 @@ class BotHandler:
     async def reset(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         if not update.effective_user or not update.message:
             return
-        if BATCH_KEY in context.chat_data:
-            del context.chat_data[BATCH_KEY]
+        self._drop_batch(context)
         session = self._get_session(update.effective_user.id)
         session.reset()
+        self._parse_cache.clear()
         await update.message.reply_text("Сессия очищена. Можно отправлять файлы заново.")
 
 
@@ -120,7 +125,7 @@ class BotHandler:
 
         context.chat_data.setdefault(BATCH_KEY, {
             'messages': [],
-            'task': None,
+            'handle': None,
             'first_message': message
         })
 
@@ -129,13 +134,18 @@ class BotHandler:
         group_data['messages'].append(message)
         session.files_received += 1
 
-        current_task = group_data.get('task')
-        if current_task:
-            current_task.cancel()
-
-        loop = asyncio.get_event_loop()
-        scheduled_task = loop.create_task(self._finalize_and_process_batch(context,session))
-        group_data['task'] = scheduled_task
+        # Debounce: one timer per batch, re-armed on every new document.
+        pending_handle = group_data.get('handle')
+        if pending_handle:
+            pending_handle.cancel()
+
+        loop = asyncio.get_running_loop()
+        group_data['handle'] = loop.call_later(
+            BATCH_DEBOUNCE_SECONDS,
+            lambda: context.application.create_task(
+                self._finalize_and_process_batch(context, session)
+            ),
+        )
 
     async def export(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
@@ -151,6 +161,8 @@ class BotHandler:
             )
             return
 
+        # The batch is being processed now; its "send /export" summary is moot.
+        self._cancel_batch_timer(group_data)
         await self._run_parser_job(update,group_data,context,session)
 
         total = len(session.participants)
@@ -160,8 +172,7 @@ class BotHandler:
             await update.message.reply_text(
                 "Нет данных о переписке. Отправьте файл, где есть участники чата."
             )
-            if BATCH_KEY in context.chat_data:
-                del context.chat_data[BATCH_KEY]
+            self._drop_batch(context)
             session.reset()
             return
 
@@ -170,8 +181,7 @@ class BotHandler:
         else:
             await self._send_excel(update.message, session)
 
-        if BATCH_KEY in context.chat_data:
-            del context.chat_data[BATCH_KEY]
+        self._drop_batch(context)
         session.reset()
 
     # Output helpers ------------------------------------------------------
@@ -187,7 +197,7 @@ class BotHandler:
         count = len(all_docs)
 
         if not all_docs:
-            del context.chat_data[BATCH_KEY]
+            self._drop_batch(context)
             return
 
         await first_message.reply_text(
@@ -220,14 +230,38 @@ class BotHandler:
             )
             await update.effective_chat.send_action(ChatAction.TYPING)
 
-            for doc in all_docs:
-                payload = await self.file_manager.fetch_file_bytes(
-                    context.bot, doc.file_id
+            payloads = await asyncio.gather(
+                *(
+                    self.file_manager.fetch_file_bytes(context.bot, doc.file_id)
+                    for doc in all_docs
+                )
+            )
+            await update.effective_chat.send_action(ChatAction.TYPING)
+            parsed_list = await asyncio.gather(
+                *(
+                    self._parse_cached(doc.file_name, payload)
+                    for doc, payload in zip(all_docs, payloads)
                 )
-                await update.effective_chat.send_action(ChatAction.TYPING)
-                parsed = self.data_processor.parse_document(doc.file_name, payload)
+            )
+            for parsed in parsed_list:
                 session.merge(parsed)
 
+    async def _parse_cached(self, file_name: str, payload: bytes | bytearray) -> ParsedData:
+        key = hashlib.blake2b(payload, digest_size=16).digest()
+        parsed = self._parse_cache.get(key)
+        if parsed is not None:
+            self._parse_cache.move_to_end(key)
+            return parsed
+        # Parsing is CPU-bound; run it off the event loop so other chats stay responsive.
+        parsed = await asyncio.to_thread(
+            self.data_processor.parse_document, file_name, payload
+        )
+        if parsed is not None:
+            self._parse_cache[key] = parsed
+            if len(self._parse_cache) > PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+        return parsed
+
     async def _send_excel(
         self,
         message,
@@ -250,6 +284,19 @@ class BotHandler:
         LOGGER.info("Bot starting...")
         self.application.run_polling(close_loop=False)
 
+    @staticmethod
+    def _drop_batch(context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Forget the pending batch and cancel its summary timer."""
+        group_data = context.chat_data.pop(BATCH_KEY, None)
+        if group_data:
+            BotHandler._cancel_batch_timer(group_data)
+
+    @staticmethod
+    def _cancel_batch_timer(group_data: Dict) -> None:
+        pending_handle = group_data.get('handle')
+        if pending_handle:
+            pending_handle.cancel()
+
     def _get_session(self, user_id: int) -> SessionData:
         if user_id not in self.sessions:
             self.sessions[user_id] = SessionData()
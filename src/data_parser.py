@@ -1,27 +1,72 @@
 from __future__ import annotations
 
-import json
 import re
+import sys
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Iterable, List, Set, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
-from bs4 import BeautifulSoup
+import msgspec
 
 from .models import IdentityRecord, ParsedData
 
 
-MENTION_PATTERN = re.compile(r"@([A-Za-z0-9_]{5,})")
+MENTION_OR_CHANNEL_PATTERN = re.compile(
+    r"@(?P<mention>[A-Za-z0-9_]{5,})|(?:https?://)?t\.me/(?P<channel>[A-Za-z0-9_]+)",
+    flags=re.IGNORECASE,
+)
 CHANNEL_LINK_PATTERN = re.compile(
     r"(?:https?://)?t\.me/([A-Za-z0-9_]+)", flags=re.IGNORECASE
 )
-DELETED_TOKENS = ("deleted account", "удалённый", "удаленный")
+DELETED_PATTERN = re.compile(r"deleted account|удал[её]нный", flags=re.IGNORECASE)
+
+
+# Export schema ---------------------------------------------------------------
+# Only the fields read below are declared; msgspec skips everything else
+# (media, reactions, ...) without allocating Python objects for it. Types are
+# kept loose where exports vary, and messages are decoded one by one so a
+# single off-schema message is skipped instead of failing the whole file.
+class Entity(msgspec.Struct):
+    text: Optional[str] = None
+    href: Optional[str] = None
+    url: Optional[str] = None
+
+
+class Message(msgspec.Struct):
+    type: Optional[str] = None
+    from_: Optional[str] = msgspec.field(default=None, name="from")
+    from_id: Union[str, int, None] = None
+    actor: Optional[str] = None
+    actor_id: Union[str, int, None] = None
+    from_username: Optional[str] = None
+    username: Optional[str] = None
+    date: Optional[str] = None
+    # Plain string or a list of strings and {"type": ..., "text": ...} chunks.
+    text: Any = None
+    text_entities: Optional[List[Entity]] = None
+    entities: Optional[List[Entity]] = None
+
+
+class DateRange(msgspec.Struct):
+    to: Optional[str] = None
+
+
+class Export(msgspec.Struct):
+    messages: List[msgspec.Raw] = []
+    date: Optional[str] = None
+    exported_at: Optional[str] = None
+    date_range: Optional[DateRange] = None
+
+
+EXPORT_DECODER = msgspec.json.Decoder(Export)
+MESSAGE_DECODER = msgspec.json.Decoder(Message)
 
 
 class DataParser:
     """Parses Telegram export files (JSON) and extracts participants."""
 
-    def parse(self, file_name: str, payload: bytes) -> ParsedData:
+    def parse(self, file_name: str, payload: bytes | bytearray) -> ParsedData:
         file_name = (file_name or "").lower()
         if file_name.endswith(".json"):
             return self._parse_json(payload)
@@ -31,68 +76,80 @@ class DataParser:
             return self._parse_json(payload)
 
     # JSON parsing ---------------------------------------------------------
-    def _parse_json(self, payload: bytes) -> ParsedData:
+    def _parse_json(self, payload: bytes | bytearray) -> ParsedData:
         try:
-            raw = json.loads(payload.decode("utf-8"))
-        except Exception as exc:  # pragma: no cover - defensive logging
+            raw = EXPORT_DECODER.decode(payload)
+        except msgspec.DecodeError as exc:
             raise ValueError("Не удалось разобрать JSON-файл экспорта") from exc
 
-        messages = raw.get("messages", [])
-        exported_at = self._extract_exported_at(raw)
-
         authors: Dict[str, IdentityRecord] = {}
         mentions, channels = set(), set()
 
-        for message in messages:
-            if not isinstance(message, dict):
-                continue
-            if message.get("type") not in (None, "message", "service"):
-                continue
-            sender = message.get("from") or message.get("actor")
-            if self._is_deleted(sender):
+        decode_message = MESSAGE_DECODER.decode
+        process_message = self._process_message
+        for item in raw.messages:
+            try:
+                message = decode_message(item)
+            except msgspec.ValidationError:
                 continue
-            identifier = self._build_identifier(
-                username=self._extract_username(message),
-                fallback=str(message.get("from_id") or message.get("actor_id") or ""),
-                full_name=sender,
-            )
-            if identifier and identifier not in authors:
-                authors[identifier] = IdentityRecord(
-                    identifier=identifier,
-                    username=self._extract_username(message),
-                    full_name=sender,
-                    registered_at=self._safe_iso_date(message.get("date")),
-                )
-            elif identifier:
-                record = authors[identifier]
-                msg_date = self._safe_iso_date(message.get("date"))
-                if msg_date and (
-                    not record.registered_at or msg_date < record.registered_at
-                ):
-                    record.registered_at = msg_date
-
-            text_content = self._stringify_text(message)
-            msg_mentions, msg_channels = self._extract_mentions(text_content)
-            mentions.update(msg_mentions)
-            channels.update(msg_channels)
-
-            for entity in self._extract_entities(message):
-                if entity.startswith("@"):
-                    mentions.add(entity)
-                else:
-                    channels.add(entity)
+            process_message(message, authors, mentions, channels)
 
         return ParsedData(
-            exported_at=exported_at,
+            exported_at=self._extract_exported_at(raw),
             participants=list(authors.values()),
             mentions=self._records_from_handles(mentions),
             channels=self._records_from_handles(channels, assume_channel=True),
         )
 
+    @staticmethod
+    def _process_message(
+        message: Message,
+        authors: Dict[str, IdentityRecord],
+        mentions: Set[str],
+        channels: Set[str],
+    ) -> None:
+        """Fold one message into the per-file accumulators (mutated in place)."""
+        if message.type not in (None, "message", "service"):
+            return
+        sender = message.from_ or message.actor
+        if DataParser._is_deleted(sender):
+            return
+        username = DataParser._extract_username(message)
+        identifier = DataParser._build_identifier(
+            username=username,
+            fallback=str(message.from_id or message.actor_id or ""),
+            full_name=sender,
+        )
+        record = authors.get(identifier) if identifier else None
+        msg_date = DataParser._safe_iso_date(message.date)
+        if identifier and record is None:
+            authors[identifier] = IdentityRecord(
+                identifier=identifier,
+                username=username,
+                full_name=sender,
+                registered_at=msg_date,
+            )
+        elif record is not None:
+            if msg_date and (
+                not record.registered_at or msg_date < record.registered_at
+            ):
+                record.registered_at = msg_date
+
+        text_content = DataParser._stringify_text(message)
+        msg_mentions, msg_channels = DataParser._extract_mentions(text_content)
+        mentions.update(msg_mentions)
+        channels.update(msg_channels)
+
+        for entity in DataParser._extract_entities(message):
+            if entity.startswith("@"):
+                mentions.add(entity)
+            else:
+                channels.add(entity)
+
     # Helpers ---------------------------------------------------------------
     @staticmethod
-    def _stringify_text(message: Dict) -> str:
-        text = message.get("text")
+    def _stringify_text(message: Message) -> str:
+        text = message.text
         if isinstance(text, str):
             return text
         if isinstance(text, list):
@@ -101,31 +158,27 @@ class DataParser:
                 if isinstance(chunk, str):
                     fragments.append(chunk)
                 elif isinstance(chunk, dict):
-                    fragments.append(chunk.get("text", ""))
+                    chunk_text = chunk.get("text")
+                    if isinstance(chunk_text, str):
+                        fragments.append(chunk_text)
             return " ".join(fragments)
         return ""
 
     @staticmethod
-    def _extract_entities(message: Dict) -> Iterable[str]:
-        entities = message.get("text_entities") or message.get("entities") or []
-        for entity in entities:
-            text = entity.get("text") or ""
+    def _extract_entities(message: Message) -> Iterable[str]:
+        for entity in message.text_entities or message.entities or []:
+            text = entity.text or ""
             if text.startswith("@"):
                 yield text
                 continue
-            url = entity.get("href") or entity.get("url")
+            url = entity.href or entity.url
             handle = DataParser._handle_from_href(url)
             if handle:
                 yield handle
 
     @staticmethod
-    def _extract_username(message: Dict) -> str | None:
-        username = message.get("from_username") or message.get("username")
-        return DataParser._normalize_username(username)
-
-    @staticmethod
-    def _extract_username_attr(message) -> str | None:
-        username = message.get("data-username")
+    def _extract_username(message: Message) -> str | None:
+        username = message.from_username or message.username
         return DataParser._normalize_username(username)
 
     @staticmethod
@@ -137,15 +190,23 @@ class DataParser:
             return None
         if not value.startswith("@"):
             value = f"@{value}"
-        return value
+        return sys.intern(value)
 
     @staticmethod
     def _extract_mentions(text: str) -> Tuple[Set[str], Set[str]]:
-        mentions = {f"@{match.lower()}" for match in MENTION_PATTERN.findall(text)}
-        channels = {
-            f"t.me/{match.lower()}" for match in CHANNEL_LINK_PATTERN.findall(text)
-        }
-        return mentions, channels
+        # Every match needs "@" or the "/" of "t.me/"; most messages have neither,
+        # and a substring check is far cheaper than starting the regex engine.
+        if "@" not in text and "/" not in text:
+            return set(), set()
+        mentions: List[str] = []
+        channels: List[str] = []
+        for match in MENTION_OR_CHANNEL_PATTERN.finditer(text):
+            mention, channel = match.group("mention", "channel")
+            if mention:
+                mentions.append(f"@{mention.lower()}")
+            else:
+                channels.append(f"t.me/{channel.lower()}")
+        return set(mentions), set(channels)
 
     @staticmethod
     def _handle_from_href(href: str | None) -> str | None:
@@ -159,74 +220,73 @@ class DataParser:
         return None
 
     @staticmethod
-    def _extract_html_date(message) -> str | None:
-        date_node = message.select_one(".date")
-        if not date_node:
-            return None
-        raw = date_node.get("title") or date_node.get_text(strip=True)
-        return DataParser._safe_iso_date(raw)
-
-    @staticmethod
+    @lru_cache(maxsize=4096)
     def _safe_iso_date(raw: str | None) -> str | None:
         if not raw:
             return None
         raw = raw.strip()
-        if not raw:
-            return None
+        # Pick the format from its separators instead of trying each in turn.
         try:
-            parsed = datetime.fromisoformat(raw.replace("Z", "+00:00"))
-        except ValueError:
-            # Accept formats like "03.12.2024 12:05:00"
-            try:
+            if raw[4:5] == "-":
+                parsed = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+            elif raw[2:3] == "." or raw[1:2] == ".":
+                # Accept formats like "03.12.2024 12:05:00" and "3.12.2024 12:05:00"
                 parsed = datetime.strptime(raw, "%d.%m.%Y %H:%M:%S")
-            except ValueError:
+            else:
                 return None
+        except ValueError:
+            return None
         return parsed.isoformat()
 
     @staticmethod
-    def _extract_exported_at(raw: Dict) -> datetime:
+    def _extract_exported_at(raw: Export) -> Optional[datetime]:
         date_value = (
-            raw.get("date")
-            or raw.get("exported_at")
-            or raw.get("date_range", {}).get("to")
+            raw.date
+            or raw.exported_at
+            or (raw.date_range.to if raw.date_range else None)
         )
         parsed = DataParser._safe_iso_date(date_value)
         if parsed:
             return datetime.fromisoformat(parsed)
-        return datetime.utcnow()
+        # No date in the export: leave it to SessionData.as_rows to use the
+        # current time, so cached parse results never carry a stale timestamp.
+        return None
 
     @staticmethod
     def _is_deleted(name: str | None) -> bool:
         if not name:
             return False
-        lowered = name.lower()
-        return any(token in lowered for token in DELETED_TOKENS)
+        return DELETED_PATTERN.search(name) is not None
 
     @staticmethod
     def _build_identifier(
         username: str | None, fallback: str | None, full_name: str | None
     ) -> str:
         if username:
-            return username.lower()
-        if fallback:
+            identifier = username.lower()
+        elif fallback:
             full = (full_name or "").lower()
-            return f"{fallback}:{full}"
-        return (full_name or "unknown").lower()
+            identifier = f"{fallback}:{full}"
+        else:
+            identifier = (full_name or "unknown").lower()
+        # Heavy posters repeat the same handle thousands of times; share one string.
+        return sys.intern(identifier)
 
     @staticmethod
     def _records_from_handles(
         handles: Iterable[str], assume_channel: bool = False
     ) -> List[IdentityRecord]:
-        records = []
+        records: List[IdentityRecord] = []
+        append = records.append
+        has_channel = True if assume_channel else None
         for handle in sorted(handles):
-            username = handle if handle.startswith("@") else handle
-            identifier = handle.lower()
-            records.append(
+            is_username = handle.startswith("@")
+            append(
                 IdentityRecord(
-                    identifier=identifier,
-                    username=username if username.startswith("@") else None,
-                    full_name=None if username.startswith("@") else username,
-                    has_channel=True if assume_channel else None,
+                    identifier=handle.lower(),
+                    username=handle if is_username else None,
+                    full_name=None if is_username else handle,
+                    has_channel=has_channel,
                 )
             )
         return records
@@ -12,6 +12,6 @@ class DataProcessor:
     def __init__(self) -> None:
         self.parser = DataParser()
 
-    def parse_document(self, file_name: str, payload: bytes) -> ParsedData:
+    def parse_document(self, file_name: str, payload: bytes | bytearray) -> ParsedData:
         return self.parser.parse(file_name, payload)
 
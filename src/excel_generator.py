@@ -3,7 +3,7 @@ from __future__ import annotations
 from io import BytesIO
 from typing import Dict, List
 
-import pandas as pd
+import xlsxwriter
 
 
 COLUMNS = [
@@ -23,12 +23,14 @@ class ExcelGenerator:
         self, tables: Dict[str, List[Dict[str, str]]]
     ) -> bytes:
         buffer = BytesIO()
-        with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
+        with xlsxwriter.Workbook(buffer, {"in_memory": True}) as workbook:
+            header_format = workbook.add_format({"bold": True, "border": 1})
             for sheet_name, rows in tables.items():
-                frame = pd.DataFrame(rows, columns=COLUMNS)
-                frame.to_excel(writer, sheet_name=self._sheet_title(sheet_name), index=False)
-        buffer.seek(0)
-        return buffer.read()
+                worksheet = workbook.add_worksheet(self._sheet_title(sheet_name))
+                worksheet.write_row(0, 0, COLUMNS, header_format)
+                for index, row in enumerate(rows, start=1):
+                    worksheet.write_row(index, 0, [row[column] for column in COLUMNS])
+        return buffer.getvalue()
 
     @staticmethod
     def _sheet_title(key: str) -> str:
@@ -1,8 +1,68 @@
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
 
+from aiolimiter import AsyncLimiter
 from telegram import Bot, Document
+from telegram.error import RetryAfter, TimedOut
+
+
+class DownloadThrottle:
+    """Rate limit plus AIMD concurrency control for file downloads.
+
+    Every download waits for a token from a sliding-window limiter and for a free
+    slot. Fast downloads widen the window additively; flood-control and timeout
+    errors halve it, at most once per ``target_latency`` so that a burst of
+    failures from one congestion event backs off once instead of collapsing to one.
+    """
+
+    def __init__(
+        self,
+        rate: float = 25,
+        period: float = 1.0,
+        initial_concurrency: int = 4,
+        max_concurrency: int = 16,
+        target_latency: float = 2.0,
+    ) -> None:
+        self._limiter = AsyncLimiter(rate, period)
+        self._concurrency = float(initial_concurrency)
+        self._max_concurrency = max_concurrency
+        self._target_latency = target_latency
+        self._active = 0
+        self._last_decrease = float("-inf")
+        self._condition = asyncio.Condition()
+
+    @property
+    def concurrency(self) -> int:
+        return max(1, round(self._concurrency))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._active < self.concurrency)
+            self._active += 1
+        try:
+            async with self._limiter:
+                started = time.monotonic()
+                yield
+        except (RetryAfter, TimedOut):
+            now = time.monotonic()
+            if now - self._last_decrease >= self._target_latency:
+                self._concurrency = max(1.0, self._concurrency * 0.5)
+                self._last_decrease = now
+            raise
+        else:
+            if time.monotonic() - started <= self._target_latency:
+                self._concurrency = min(
+                    float(self._max_concurrency), self._concurrency + 0.5
+                )
+        finally:
+            async with self._condition:
+                self._active -= 1
+                self._condition.notify_all()
 
 
 class FileManager:
@@ -10,13 +70,18 @@ class FileManager:
 
     ALLOWED_SUFFIXES = ".json"
 
+    def __init__(self) -> None:
+        self.throttle = DownloadThrottle()
+
     @staticmethod
     def is_supported(document: Document) -> bool:
         if not document.file_name:
             return False
         return document.file_name.lower().endswith(FileManager.ALLOWED_SUFFIXES)
 
-    async def fetch_file_bytes(self, bot: Bot, file_id: str) -> bytes:
-        telegram_file = await bot.get_file(file_id)
-        payload = await telegram_file.download_as_bytearray()
-        return bytes(payload)
+    async def fetch_file_bytes(self, bot: Bot, file_id: str) -> bytes | bytearray:
+        async with self.throttle.slot():
+            telegram_file = await bot.get_file(file_id)
+            # msgspec and hashlib read the bytearray directly; converting it to
+            # bytes would only copy the whole file once more.
+            return await telegram_file.download_as_bytearray()
@@ -5,7 +5,10 @@ from datetime import datetime
 from typing import Dict, Iterable, List, Optional
 
 
-@dataclass
+_BOOL_TO_TEXT = {None: "Неизвестно", True: "Да", False: "Нет"}
+
+
+@dataclass(slots=True)
 class IdentityRecord:
     identifier: str
     username: Optional[str] = None
@@ -14,26 +17,10 @@ class IdentityRecord:
     registered_at: Optional[str] = None
     has_channel: Optional[bool] = None
 
-    def to_row(self, exported_at: datetime) -> Dict[str, Optional[str]]:
-        return {
-            "Дата экспорта": exported_at.isoformat(),
-            "Username": self.username or "",
-            "Имя и фамилия": self.full_name or "",
-            "Описание": self.bio or "",
-            "Дата регистрации": self.registered_at or "",
-            "Наличие канала": self._bool_to_text(self.has_channel),
-        }
-
-    @staticmethod
-    def _bool_to_text(value: Optional[bool]) -> str:
-        if value is None:
-            return "Неизвестно"
-        return "Да" if value else "Нет"
 
-
-@dataclass
+@dataclass(slots=True)
 class ParsedData:
-    exported_at: datetime
+    exported_at: Optional[datetime]
     participants: List[IdentityRecord] = field(default_factory=list)
     mentions: List[IdentityRecord] = field(default_factory=list)
     channels: List[IdentityRecord] = field(default_factory=list)
@@ -49,19 +36,11 @@ class SessionData:
     files_received: int = 0
 
     def merge(self, parsed: ParsedData) -> Dict[str, int]:
-        counters = {"participants": 0, "mentions": 0, "channels": 0}
-        for record in parsed.participants:
-            if record.identifier not in self.participants:
-                self.participants[record.identifier] = record
-                counters["participants"] += 1
-        for record in parsed.mentions:
-            if record.identifier not in self.mentions:
-                self.mentions[record.identifier] = record
-                counters["mentions"] += 1
-        for record in parsed.channels:
-            if record.identifier not in self.channels:
-                self.channels[record.identifier] = record
-                counters["channels"] += 1
+        counters = {
+            "participants": _merge_records(self.participants, parsed.participants),
+            "mentions": _merge_records(self.mentions, parsed.mentions),
+            "channels": _merge_records(self.channels, parsed.channels),
+        }
         self.files_processed += 1
         self.last_exported_at = parsed.exported_at
         return counters
@@ -85,7 +64,30 @@ class SessionData:
         }
 
 
+def _merge_records(
+    target: Dict[str, IdentityRecord], records: Iterable[IdentityRecord]
+) -> int:
+    """Add unseen records to ``target`` (first wins) and return how many were new."""
+    before = len(target)
+    setdefault = target.setdefault
+    for record in records:
+        setdefault(record.identifier, record)
+    return len(target) - before
+
+
 def _records_to_rows(
     records: Iterable[IdentityRecord], exported_at: datetime
 ) -> List[Dict[str, Optional[str]]]:
-    return [record.to_row(exported_at) for record in records]
+    exported_at_text = exported_at.isoformat()
+    bool_to_text = _BOOL_TO_TEXT
+    return [
+        {
+            "Дата экспорта": exported_at_text,
+            "Username": record.username or "",
+            "Имя и фамилия": record.full_name or "",
+            "Описание": record.bio or "",
+            "Дата регистрации": record.registered_at or "",
+            "Наличие канала": bool_to_text[record.has_channel],
+        }
+        for record in records
+    ]